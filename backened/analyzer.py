@@ -1,26 +1,23 @@
 import re
 import subprocess
 import utils
+import parallel
+import fast
 
-def analyze_code(filename: str, code: str):
-    if filename.endswith(".py"):
-        language = "python"
-    elif filename.endswith(".js"):
-        language = "javascript"
-    else:
-        language = filename.split(".")[-1]
-    
-    if language not in ["python", "javascript"]:
-        raise ValueError(f"Unsupported language: {language}")
-
-    score = 100
-    recommendations = []
+def run_sections(language, code):
+    """Run the six section checks for a language and return their result dicts."""
     dict1, dict2, dict3, dict4, dict5, dict6 = {}, {}, {}, {}, {}, {}
 
-    print("🔍 Analyzing code for:", filename)  # Debugging print
+    # Very large Python files: spread the per-definition checks over a process pool
+    sections = None
+    if language == "python" and parallel.is_large_file(code):
+        sections = parallel.analyze_python_parallel(code)
 
     # Naming conventions check
-    if language == "python":
+    if sections is not None:
+        dict1, dict2, dict3, dict4, dict5, dict6 = sections
+
+    elif language == "python":
         dict1=utils.check_naming_conventions_from_string(code)
         dict2=utils.analyze_function_length_and_modularity(code)
         dict3=utils.analyze_comments_and_docstrings(code)
@@ -36,6 +33,37 @@ def analyze_code(filename: str, code: str):
         dict5=utils.analyze_js_reusability(code)
         dict6=utils.analyze_js_best_practices(code)
 
+    return dict1, dict2, dict3, dict4, dict5, dict6
+
+def analyze_code(filename: str, code: str, mode: str = "full", latency_budget: float = None):
+    if filename.endswith(".py"):
+        language = "python"
+    elif filename.endswith(".js"):
+        language = "javascript"
+    else:
+        language = filename.split(".")[-1]
+    
+    if language not in ["python", "javascript"]:
+        raise ValueError(f"Unsupported language: {language}")
+
+    if mode not in ["full", "fast"]:
+        raise ValueError(f"Unsupported analysis mode: {mode}")
+
+    score = 100
+    recommendations = []
+
+    print("🔍 Analyzing code for:", filename)  # Debugging print
+
+    # Fast mode: analyze a deterministic sample and estimate the scores
+    approximation = None
+    if mode == "fast":
+        approximation = fast.analyze_sample(language, code, latency_budget or fast.DEFAULT_LATENCY_BUDGET, run_sections)
+
+    if approximation is not None:
+        (dict1, dict2, dict3, dict4, dict5, dict6), intervals, sample = approximation
+    else:
+        dict1, dict2, dict3, dict4, dict5, dict6 = run_sections(language, code)
+
     # Ensure the score is never negative
     analysis_dicts = {
         "Naming Conventions": dict1,
@@ -58,8 +86,18 @@ def analyze_code(filename: str, code: str):
     # Prepare metrics list
     metrics = [{"name": section, "score": d.get("score", 0)} for section, d in analysis_dicts.items()]
 
-    return {
+    result = {
         "overall_score": total_score,
         "metrics": metrics,  # List of dictionaries with names and scores
         "issues": all_issues
     }
+
+    # Estimated scores come with confidence bounds and sample details
+    if approximation is not None:
+        for metric, interval in zip(metrics, intervals):
+            metric["confidence_interval"] = interval
+        result["overall_confidence_interval"] = [round(sum(low for low, _ in intervals), 1), round(sum(high for _, high in intervals), 1)]
+        result["approximate"] = True
+        result["sample"] = sample
+
+    return result
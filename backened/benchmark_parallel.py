@@ -0,0 +1,73 @@
+"""Benchmark the parallel analysis path against the serial one on a large generated module.
+
+Usage: ANALYSIS_WORKERS=1 python benchmark_parallel.py [number_of_functions]
+
+The pool gets cpu_count // ANALYSIS_WORKERS processes, so ANALYSIS_WORKERS=1 gives it every core
+(the default, half the cores, leaves it at least two).
+"""
+import sys
+import time
+import parallel
+import utils
+
+FUNCTION_TEMPLATE = '''
+@decorator
+def function_{i}(items, limit={i}):
+    """Process items for case {i}."""
+    total = 0  # running total
+    for item in items:
+        if item > limit and item % 3:
+            total += helper(item, "value_{i}")
+        elif item < 0:
+            total -= log(item)
+    return [x for x in items if x]
+
+
+class Handler{i}:
+    def Run(self, data):
+        resultValue = process(data)
+        return resultValue
+
+'''
+
+
+def generate_module(function_count):
+    header = '"""Generated module used to benchmark the analyzer."""\nimport os\n\nLIMIT = os.getenv("LIMIT")\n'
+    return header + "".join(FUNCTION_TEMPLATE.format(i=i % 500) for i in range(function_count))
+
+
+def run_serial(code):
+    return (
+        utils.check_naming_conventions_from_string(code),
+        utils.analyze_function_length_and_modularity(code),
+        utils.analyze_comments_and_docstrings(code),
+        utils.analyze_formatting_and_indentation(code),
+        utils.analyze_reusability_and_dry(code),
+        utils.analyze_web_dev_best_practices(code),
+    )
+
+
+def main():
+    function_count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    code = generate_module(function_count)
+    print(f"Module: {code.count(chr(10)) + 1} lines, {function_count} functions, {parallel.PARALLEL_WORKERS} workers")
+
+    start = time.perf_counter()
+    serial = run_serial(code)
+    serial_time = time.perf_counter() - start
+
+    # Warm up the pool so process start-up isn't counted
+    parallel.analyze_python_parallel(generate_module(10))
+    start = time.perf_counter()
+    parallel_result = parallel.analyze_python_parallel(code)
+    parallel_time = time.perf_counter() - start
+
+    print(f"Serial:   {serial_time:.2f}s")
+    print(f"Parallel: {parallel_time:.2f}s ({serial_time / parallel_time:.1f}x)")
+    if parallel_result != serial:
+        sys.exit("Parallel results differ from the serial path!")
+    print("Results identical to the serial path.")
+
+
+if __name__ == "__main__":
+    main()
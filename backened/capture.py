@@ -0,0 +1,92 @@
+import hashlib
+import json
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Capture settings; a sample rate of 0 (the default) disables capture
+CAPTURE_SAMPLE_RATE = float(os.getenv("CAPTURE_SAMPLE_RATE", 0))
+CAPTURE_PATH = os.getenv("CAPTURE_PATH", os.path.join("captures", "requests.jsonl"))
+# "none": keep content as-is, "secrets": mask likely secrets, "content": keep metadata only
+CAPTURE_REDACTION = os.getenv("CAPTURE_REDACTION", "secrets")
+REDACTION_MODES = ("none", "secrets", "content")
+
+# Same secret shapes the best-practices checks look for, plus obvious assignments
+SECRET_PATTERNS = [
+    re.compile(r"sk-[a-zA-Z0-9]+|AIza[0-9A-Za-z\-_]+|AKIA[0-9A-Z]+"),
+    re.compile(r"(?i)((?:password|passwd|secret|token|api_?key)\s*[:=]\s*)(['\"])[^'\"]*\2"),
+]
+
+
+def detect_language(filename):
+    if filename.endswith(".py"):
+        return "python"
+    if filename.endswith(".js"):
+        return "javascript"
+    return filename.split(".")[-1]
+
+
+def redact_secrets(content):
+    """Mask secrets while keeping the content the same length, so replay timings stay realistic."""
+    content = SECRET_PATTERNS[0].sub(lambda m: "x" * len(m.group(0)), content)
+    return SECRET_PATTERNS[1].sub(lambda m: m.group(1) + m.group(2) + "x" * (len(m.group(0)) - len(m.group(1)) - 2) + m.group(2), content)
+
+
+class RequestCapture:
+    """Appends a sample of /analyze-code requests to a JSON Lines archive for later replay."""
+
+    def __init__(self, path=CAPTURE_PATH, sample_rate=CAPTURE_SAMPLE_RATE, redaction=CAPTURE_REDACTION):
+        if redaction not in REDACTION_MODES:
+            raise ValueError(f"Unsupported redaction mode: {redaction}")
+        self.path = path
+        self.sample_rate = sample_rate
+        self.redaction = redaction
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self.sample_rate > 0
+
+    def should_capture(self):
+        return self.enabled and random.random() < self.sample_rate
+
+    def record(self, filename, content, options, status_code, duration):
+        """Append one request to the archive; write errors are logged, never raised, so capture can't fail a request."""
+        language = detect_language(filename)
+        entry = {
+            "timestamp": time.time(),
+            "filename": filename if self.redaction == "none" else f"upload.{filename.split('.')[-1]}",
+            "language": language,
+            "sha256": hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest(),
+            "size": len(content),
+            "lines": content.count("\n") + 1,
+            "options": options,
+            "status_code": status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "redaction": self.redaction,
+        }
+        if self.redaction == "none":
+            entry["content"] = content
+        elif self.redaction == "secrets":
+            entry["content"] = redact_secrets(content)
+
+        line = json.dumps(entry)
+        with self._lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                with open(self.path, "a", encoding="utf-8") as archive:
+                    archive.write(line + "\n")
+            except OSError:
+                logger.exception("Could not write request capture to %s", self.path)
+
+
+def load_captures(path):
+    with open(path, encoding="utf-8") as archive:
+        return [json.loads(line) for line in archive if line.strip()]
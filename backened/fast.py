@@ -0,0 +1,298 @@
+import ast
+import functools
+import math
+import os
+import random
+import re
+import textwrap
+import time
+import utils
+
+# Rough analysis throughput (characters of source per second) used to turn a
+# latency budget into a sample size
+FAST_CHARS_PER_SECOND = int(os.getenv("FAST_ANALYSIS_CHARS_PER_SECOND", 100000))
+DEFAULT_LATENCY_BUDGET = float(os.getenv("FAST_ANALYSIS_LATENCY_BUDGET", 2.0))
+MIN_SAMPLE_CHARS = 5000
+# Units are kept small enough that at least this many fit in a sample; bigger
+# units (a whole class, minified code) are split further
+MIN_UNITS_PER_SAMPLE = 3
+# Half-samples re-scored to get the confidence bounds
+REPLICATES = 10
+SAMPLE_SEED = 0
+
+# Maximum score of each section, in analyzer order
+SECTION_MAX_SCORES = (10, 20, 20, 15, 15, 20)
+
+# Sections whose deductions add up per occurrence (e.g. -5 per long function):
+# section index -> (points per occurrence, result key holding the count). A key of
+# None means every deduction of the section is per occurrence; otherwise the rest
+# are one-off deductions. The excerpt count is scaled up to the whole file.
+PER_OCCURRENCE_DEDUCTIONS = {
+    "python": {1: (5, None), 4: (5, "long_functions")},
+    "javascript": {0: (2, None), 1: (5, None)},
+}
+
+# Largest one-off deduction of each section: a single offending unit outside the
+# sample can cost up to this much, so the bounds of sampled sections allow for it
+# (one undocumented function drops the docstring ratio below 50% when the excerpt
+# has no functions, hence the full -10 there)
+UNSEEN_DEDUCTIONS = {
+    "python": (1, 0, 10, 5, 5, 5),
+    "javascript": (0, 0, 10, 5, 5, 5),
+}
+
+# Plain text-scan sections, cheap enough to run on the whole file instead of the
+# sample: section index -> (check, points it can't see). The Python formatting scan
+# skips the parse for indentation errors, so that deduction stays in the bounds.
+WHOLE_FILE_SECTIONS = {
+    "python": {
+        3: (functools.partial(utils.analyze_formatting_and_indentation, check_parse=False), 5),
+        5: (utils.analyze_web_dev_best_practices, 0),
+    },
+    "javascript": {
+        2: (utils.analyze_js_comments, 0),
+        4: (utils.analyze_js_reusability, 0),
+    },
+}
+# Rough text-scan throughput; bigger files get every section from the sample
+WHOLE_FILE_CHARS_PER_SECOND = 4000000
+
+# Lines that start a new top-level unit (definition / statement) in each language
+UNIT_BOUNDARY_PATTERNS = {
+    "python": re.compile(r'^(@|def\s|async\s+def\s|class\s)'),
+    "javascript": re.compile(r'^(export\s+)?(default\s+)?(async\s+)?(function|class|const|let|var)\b'),
+}
+NESTED_PYTHON_DEFINITION = re.compile(r'^(\s+)(@|def\s|async\s+def\s|class\s)')
+
+
+def _split_units(language, code):
+    """Split the file into unit texts at top-level definitions."""
+    pattern = UNIT_BOUNDARY_PATTERNS[language]
+    lines = code.split("\n")
+    starts = [0]
+    for i in range(1, len(lines)):
+        # Keep decorators together with the definition below them
+        if pattern.match(lines[i]) and not lines[i - 1].startswith("@"):
+            starts.append(i)
+    return ["\n".join(lines[start:end]) for start, end in zip(starts, starts[1:] + [len(lines)])]
+
+
+def _split_nested_python(text):
+    """Split a definition at its outermost nested definitions (e.g. a class into its methods)."""
+    lines = text.split("\n")
+    matches = [(i, len(m.group(1))) for i, m in ((i, NESTED_PYTHON_DEFINITION.match(line)) for i, line in enumerate(lines)) if m and i > 0]
+    if not matches:
+        return [text]
+
+    indent = min(width for _, width in matches)
+    starts = [0]
+    for i, width in matches:
+        previous = lines[i - 1]
+        decorated = previous.strip().startswith("@") and len(previous) - len(previous.lstrip()) == indent
+        if width == indent and not decorated:
+            starts.append(i)
+    # Dedent the pieces so each method parses as a top-level definition
+    return [textwrap.dedent("\n".join(lines[start:end])) for start, end in zip(starts, starts[1:] + [len(lines)])]
+
+
+def _windows(text, max_chars):
+    """Fixed windows of whole lines; lines longer than a window (minified code) are cut."""
+    windows = []
+    current = []
+    size = 0
+    for line in text.split("\n"):
+        while len(line) > max_chars:
+            windows.append(line[:max_chars])
+            line = line[max_chars:]
+        if current and size + len(line) + 1 > max_chars:
+            windows.append("\n".join(current))
+            current, size = [], 0
+        current.append(line)
+        size += len(line) + 1
+    if current:
+        windows.append("\n".join(current))
+    return windows
+
+
+def _split_oversized(language, text, max_chars):
+    if len(text) <= max_chars:
+        return [text]
+    if language == "python":
+        pieces = _split_nested_python(text)
+        if len(pieces) > 1:
+            return [unit for piece in pieces for unit in _split_oversized(language, piece, max_chars)]
+    return _windows(text, max_chars)
+
+
+def _is_analyzable(language, text):
+    if language != "python":
+        return True  # The JavaScript checks are regex based and take any text
+    try:
+        ast.parse(text)
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return False
+    return True
+
+
+def _estimate(language, texts, total_chars, run_sections, whole_file):
+    """Score an excerpt, scaling count-based deductions up to the size of the whole file.
+
+    `whole_file` maps section index -> result already computed on the whole file.
+    Returns (sections, scores, counts), counts holding (occurrences, one-off points
+    deducted) found in the excerpt for count-based sections (None for the others).
+    """
+    excerpt = "\n".join(texts)
+    try:
+        sections = list(run_sections(language, excerpt))
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return None, None, None
+    if any("error" in d for d in sections):
+        return None, None, None
+    for index, d in whole_file.items():
+        sections[index] = dict(d)
+
+    scale = total_chars / max(len(excerpt), 1)
+    scores = []
+    counts = []
+    per_occurrence = PER_OCCURRENCE_DEDUCTIONS[language]
+    for index, (d, max_score) in enumerate(zip(sections, SECTION_MAX_SCORES)):
+        score = d.get("score", 0)
+        count = None
+        if index in per_occurrence and index not in whole_file:
+            deduction, key = per_occurrence[index]
+            if key is None:
+                occurrences, one_off = (max_score - score) / deduction, 0
+            else:
+                # One-off deductions stay as they are, only the per-occurrence ones scale
+                occurrences = d.get(key, 0)
+                one_off = max(max_score - score - occurrences * deduction, 0)
+            count = (occurrences, one_off)
+            score = max(round(max_score - one_off - occurrences * deduction * scale), 0)
+        scores.append(score)
+        counts.append(count)
+    return tuple(sections), scores, counts
+
+
+def _count_bounds(count, deduction, max_score, scale, unseen):
+    """Score bounds from a ~95% Poisson interval on the number of occurrences seen in the excerpt.
+
+    Also covers occurrences the excerpt happened to miss (up to 3 when it found none)
+    and up to `unseen` points of one-off deductions outside the excerpt.
+    """
+    occurrences, one_off = count
+    spread = 2 * math.sqrt(occurrences + 1)
+    fewest = max(occurrences + 1 - spread, 0)
+    most = occurrences + 1 + spread
+    low = max_score - one_off - unseen - most * deduction * scale
+    high = max_score - one_off - fewest * deduction * scale
+    return [max(math.floor(low), 0), min(math.ceil(high), max_score)]
+
+
+def _unanalyzable_result(sample_info):
+    sections = tuple(
+        {"score": 0, "issues": ["No part of the file could be analyzed within the latency budget."]}
+        for _ in SECTION_MAX_SCORES
+    )
+    return sections, [[0, max_score] for max_score in SECTION_MAX_SCORES], sample_info
+
+
+def analyze_sample(language, code, latency_budget, run_sections):
+    """Estimate the section scores of a large file from a deterministic sample.
+
+    The file is split at top-level definitions; units too big for the sample are split
+    further at nested definitions or into fixed windows. Units are taken in a seeded
+    order (file header first) until the size budget implied by `latency_budget`
+    (seconds) is used up. The excerpt is scored with count-based deductions scaled to
+    the whole file, and the same estimator run on random half-samples of the excerpt
+    gives the confidence bounds. Count-based sections also get a Poisson interval on
+    the occurrences seen; the others are extended by how far their score moved from
+    the half-samples to the excerpt, once per doubling left to reach the whole file,
+    and by the largest deduction one unit outside the sample could add.
+    Cheap text-scan sections are scored on the whole file instead. Returns (sections,
+    intervals, sample_info), or None when the whole file fits in the budget and can
+    simply be analyzed in full.
+    """
+    started = time.perf_counter()
+    char_budget = latency_budget * FAST_CHARS_PER_SECOND
+    if len(code) <= char_budget:
+        return None
+
+    whole_file = {}
+    if len(code) <= latency_budget * WHOLE_FILE_CHARS_PER_SECOND:
+        whole_file = {index: check(code) for index, (check, _) in WHOLE_FILE_SECTIONS[language].items()}
+
+    # One excerpt run plus REPLICATES runs on half the excerpt
+    sample_budget = max(int(char_budget / (1 + REPLICATES / 2)), MIN_SAMPLE_CHARS)
+    max_unit = sample_budget // MIN_UNITS_PER_SAMPLE
+    units = [unit for text in _split_units(language, code) for unit in _split_oversized(language, text, max_unit)]
+
+    order = list(range(1, len(units)))
+    random.Random(SAMPLE_SEED).shuffle(order)
+    sampled = []
+    sampled_chars = 0
+    for index in [0] + order:
+        text = units[index]
+        if sampled_chars + len(text) > sample_budget or not _is_analyzable(language, text):
+            continue
+        sampled.append(index)
+        sampled_chars += len(text)
+
+    sample_info = {
+        "units": len(sampled),
+        "total_units": len(units),
+        "chars": sampled_chars,
+        "total_chars": len(code),
+        "latency_budget": latency_budget,
+        "replicates": 0,
+    }
+    # Keep the original order so the excerpt reads like the file
+    sampled.sort()
+    sections, scores, counts = _estimate(language, [units[i] for i in sampled], len(code), run_sections, whole_file) if sampled else (None, None, None)
+    if sections is None:
+        return _unanalyzable_result(sample_info)
+
+    # The header (imports, module docstring) stays in every half-sample
+    header = [0] if sampled[0] == 0 else []
+    rest = sampled[len(header):]
+    rng = random.Random(SAMPLE_SEED)
+    replicate_scores = []
+    for _ in range(REPLICATES if len(rest) > 1 else 0):
+        # Stop early rather than blow the budget, once there are a couple of replicates
+        if len(replicate_scores) >= 2 and time.perf_counter() - started > latency_budget:
+            break
+        half = sorted(header + rng.sample(rest, max(len(rest) // 2, 1)))
+        _, replicate, _ = _estimate(language, [units[i] for i in half], len(code), run_sections, whole_file)
+        if replicate is not None:
+            replicate_scores.append(replicate)
+    sample_info["replicates"] = len(replicate_scores)
+
+    scale = len(code) / max(sampled_chars, 1)
+    doublings = math.log2(scale)
+    intervals = []
+    for column, max_score in enumerate(SECTION_MAX_SCORES):
+        score = scores[column]
+        if column in whole_file:
+            unchecked = WHOLE_FILE_SECTIONS[language][column][1]
+            intervals.append([max(score - unchecked, 0), score])
+            continue
+        halves = [row[column] for row in replicate_scores]
+        low, high = min(halves + [score]), max(halves + [score])
+        unseen = UNSEEN_DEDUCTIONS[language][column]
+        if counts[column] is not None:
+            deduction, _ = PER_OCCURRENCE_DEDUCTIONS[language][column]
+            count_low, count_high = _count_bounds(counts[column], deduction, max_score, scale, unseen)
+            intervals.append([min(low, count_low), max(high, count_high)])
+        elif halves:
+            # Score change from half the excerpt to all of it, carried on to the whole file
+            trend = (score - sum(halves) / len(halves)) * doublings
+            # Agreeing half-samples don't rule out an offending unit in the unsampled
+            # text, nor a deduction that only the sample triggers
+            low += min(trend, 0) - unseen
+            high += max(trend, 0) + (unseen if score < max_score else 0)
+            intervals.append([max(math.floor(low), 0), min(math.ceil(high), max_score)])
+        else:
+            intervals.append([0, max_score])
+
+    for d, score in zip(sections, scores):
+        d["score"] = score
+    return sections, intervals, sample_info
@@ -0,0 +1,33 @@
+import os
+
+try:
+    import resource  # Not available on Windows; limits are skipped there
+except ImportError:
+    resource = None
+
+# Number of isolated analysis worker processes (see workers.AnalysisWorkerPool);
+# half the cores by default so each worker has cores left for parallel analysis
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", max((os.cpu_count() or 2) // 2, 1)))
+
+
+def apply_memory_limit(memory_limit_mb):
+    if resource is None or not memory_limit_mb:
+        return
+    limit = memory_limit_mb * 1024 * 1024
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def apply_cpu_budget(cpu_limit):
+    # RLIMIT_CPU counts the whole life of the process, so move the soft limit
+    # to "CPU used so far + budget" before every job
+    if resource is None or not cpu_limit:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + cpu_limit + 1
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
@@ -0,0 +1,91 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+from fastapi import WebSocket, WebSocketDisconnect
+from fastapi.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# Quiet period after the last update before an analysis starts
+DEBOUNCE_SECONDS = float(os.getenv("LIVE_DEBOUNCE_MS", 300)) / 1000
+
+
+class LiveAnalysisSession:
+    """One editor connection on the live-analysis WebSocket.
+
+    The client sends {"filename": ..., "content": ...} on every edit. Updates are
+    coalesced over a debounce window, a newer update cancels the analysis still
+    running for older content, and only the result for the latest content is sent
+    back as {"version": n, ...result}.
+    """
+
+    def __init__(self, websocket: WebSocket, pool, debounce=DEBOUNCE_SECONDS):
+        self.websocket = websocket
+        self.pool = pool
+        self.debounce = debounce
+        self.version = 0
+        self._task = None
+        self._cancel_event = None
+
+    async def run(self):
+        await self.websocket.accept()
+        try:
+            while True:
+                message = await self.websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+                # Binary frames have no "text" and get the same reply as bad JSON
+                update = self._parse(message.get("text"))
+                if update is None:
+                    await self.websocket.send_json({"error": "Expected {\"filename\": str, \"content\": str}", "error_type": "invalid_message"})
+                    continue
+                self._schedule(*update)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self._cancel_current()
+
+    def _parse(self, message):
+        if message is None:
+            return None
+        try:
+            data = json.loads(message)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+        filename, content = data.get("filename"), data.get("content")
+        if not isinstance(filename, str) or not isinstance(content, str):
+            return None
+        return filename, content
+
+    def _cancel_current(self):
+        # Stop the pending debounce and kill the in-flight analysis, if any
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+        if self._task is not None:
+            self._task.cancel()
+
+    def _schedule(self, filename, content):
+        self._cancel_current()
+        self.version += 1
+        self._cancel_event = threading.Event()
+        self._task = asyncio.create_task(self._analyze(self.version, filename, content, self._cancel_event))
+
+    async def _analyze(self, version, filename, content, cancel_event):
+        await asyncio.sleep(self.debounce)
+        try:
+            result = await run_in_threadpool(self.pool.run, filename, content, cancel_event)
+        except Exception as e:
+            # e.g. the worker pool is missing or already closed
+            logger.exception("Live analysis of %s failed", filename)
+            result = {"error": f"Analysis failed: {e}", "error_type": "analysis_failed"}
+        # A newer update arrived while this one was running
+        if cancel_event.is_set() or version != self.version:
+            return
+        try:
+            await self.websocket.send_json({"version": version, **result})
+        except (WebSocketDisconnect, RuntimeError):
+            pass
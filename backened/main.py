@@ -1,16 +1,37 @@
 from fastapi import FastAPI, File, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from analyzer import analyze_code
 import uvicorn
 
 
-from fastapi import FastAPI
+import time
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import List, Optional
+from fastapi import FastAPI, WebSocket
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from analyzer import analyze_code
+from fastapi.responses import JSONResponse
+from capture import RequestCapture
+from live import LiveAnalysisSession
+from metrics import extract_function_metrics, summarize_files
+from workers import AnalysisWorkerPool
 import uvicorn
 
+analysis_pool = None
+request_capture = RequestCapture()
+
+@asynccontextmanager
+async def lifespan(app):
+    # Start the isolated analysis workers with the app, stop them on shutdown
+    global analysis_pool
+    analysis_pool = AnalysisWorkerPool()
+    try:
+        yield
+    finally:
+        analysis_pool.close()
+
 # ✅ Define app first
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # ✅ Add CORS middleware AFTER defining `app`
 app.add_middleware(
@@ -21,11 +42,45 @@ app.add_middleware(
     allow_headers=["*"],  # Allow all headers
 )
 
+# HTTP status for each structured worker error
+ERROR_STATUS = {
+    "invalid_input": 400,
+    "memory_limit": 422,
+    "cpu_limit": 422,
+    "recursion_limit": 422,
+    "timeout": 504,
+}
+
 @app.post("/analyze-code")
-async def analyze_code_file(file: UploadFile = File(...)):
+async def analyze_code_file(file: UploadFile = File(...), mode: str = "full", latency_budget: Optional[float] = None):
     content = await file.read()
-    result = analyze_code(file.filename, content.decode("utf-8"))
+    code = content.decode("utf-8")
+    options = {"mode": mode, "latency_budget": latency_budget}
+    started = time.perf_counter()
+    # Run in an isolated worker so one bad file can't take down the server
+    # mode="fast" samples huge files and returns estimated scores within latency_budget seconds
+    result = await run_in_threadpool(analysis_pool.run, file.filename, code, **options)
+    status_code = ERROR_STATUS.get(result["error_type"], 500) if "error" in result else 200
+
+    # Keep a sample of real traffic for replay.py
+    if request_capture.should_capture():
+        await run_in_threadpool(request_capture.record, file.filename, code, options, status_code, time.perf_counter() - started)
+
+    if "error" in result:
+        return JSONResponse(status_code=status_code, content=result)
     return result
 
+@app.websocket("/ws/analyze")
+async def live_analysis(websocket: WebSocket):
+    # Editor plugins stream content updates; only the latest version is analyzed
+    await LiveAnalysisSession(websocket, analysis_pool).run()
+
+@app.post("/analyze-repository")
+async def analyze_repository(files: List[UploadFile] = File(...)):
+    # Per-function metric distributions across all uploaded files; each file is its
+    # own worker job, so the CPU and time limits apply per upload, not to the total
+    uploads = [(file.filename, (await file.read()).decode("utf-8")) for file in files]
+    return await run_in_threadpool(summarize_files, uploads, partial(analysis_pool.call, extract_function_metrics))
+
 if __name__ == "__main__":
     uvicorn.run(app, host="0.0.0.0", port=8000)
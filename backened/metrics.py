@@ -0,0 +1,141 @@
+import ast
+import numpy as np
+import utils
+
+# Per-function columns collected across a repository
+METRIC_FIELDS = ("body_length", "loop_count", "condition_count", "call_count", "complexity")
+
+def extract_function_metrics(code_str):
+    """Return one metrics row (name + METRIC_FIELDS values) per function in the code.
+
+    Returns None if the code can't be parsed (syntax errors, nesting too deep, ...).
+    """
+    try:
+        tree = ast.parse(code_str)
+        rows = []
+        for node in ast.walk(tree):
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                loop_count, condition_count, function_call_count = utils.count_function_constructs(node)
+                rows.append((
+                    node.name,
+                    len(node.body),
+                    loop_count,
+                    condition_count,
+                    function_call_count,
+                    utils.cyclomatic_complexity(node),
+                ))
+    except (SyntaxError, ValueError, RecursionError, MemoryError):
+        return None
+    return rows
+
+
+class RepositoryMetrics:
+    """Columnar store of per-function metrics across many files.
+
+    Rows are appended file by file and turned into NumPy arrays on first query,
+    so percentile / histogram / outlier lookups are vectorized over every function.
+    """
+
+    def __init__(self):
+        self.file_count = 0
+        self.skipped_files = []
+        self._filenames = []
+        self._function_names = []
+        self._values = {field: [] for field in METRIC_FIELDS}
+        self._columns = None
+
+    def add_file(self, filename, code_str):
+        """Collect metrics for every function in a Python file. Returns the number of functions added."""
+        if not filename.endswith(".py"):
+            return 0
+        return self.add_rows(filename, extract_function_metrics(code_str))
+
+    def add_rows(self, filename, rows):
+        """Add the rows extract_function_metrics returned for a file (None marks it skipped)."""
+        if rows is None:
+            # Unparseable files are reported instead of failing the whole repository
+            self.skipped_files.append(filename)
+            return 0
+
+        self.file_count += 1
+        for name, *values in rows:
+            self._filenames.append(filename)
+            self._function_names.append(name)
+            for field, value in zip(METRIC_FIELDS, values):
+                self._values[field].append(value)
+
+        # Invalidate cached arrays
+        self._columns = None
+        return len(rows)
+
+    def __len__(self):
+        return len(self._function_names)
+
+    def column(self, metric):
+        if metric not in METRIC_FIELDS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if self._columns is None:
+            self._columns = {field: np.asarray(values, dtype=np.int64) for field, values in self._values.items()}
+        return self._columns[metric]
+
+    def percentiles(self, metric, q=(50, 75, 90, 95, 99)):
+        values = self.column(metric)
+        if values.size == 0:
+            return {f"p{p}": 0.0 for p in q}
+        return {f"p{p}": float(v) for p, v in zip(q, np.percentile(values, q))}
+
+    def histogram(self, metric, bins=10):
+        values = self.column(metric)
+        if values.size == 0:
+            return {"counts": [], "bin_edges": []}
+        counts, edges = np.histogram(values, bins=bins)
+        return {"counts": counts.tolist(), "bin_edges": edges.tolist()}
+
+    def outliers(self, metric, k=1.5, limit=None):
+        """Functions above the Tukey fence (Q3 + k * IQR), largest first."""
+        values = self.column(metric)
+        if values.size == 0:
+            return []
+
+        q1, q3 = np.percentile(values, [25, 75])
+        fence = q3 + k * (q3 - q1)
+        indices = np.nonzero(values > fence)[0]
+        # Sort descending by metric value
+        indices = indices[np.argsort(-values[indices], kind="stable")]
+        if limit is not None:
+            indices = indices[:limit]
+
+        return [
+            {"file": self._filenames[i], "function": self._function_names[i], "value": int(values[i])}
+            for i in indices
+        ]
+
+    def summary(self, outlier_limit=10):
+        """Distribution of every metric, ready to be returned from the API."""
+        result = {"files": self.file_count, "skipped_files": self.skipped_files, "functions": len(self), "metrics": {}}
+        for metric in METRIC_FIELDS:
+            values = self.column(metric)
+            result["metrics"][metric] = {
+                "mean": float(values.mean()) if values.size else 0.0,
+                "max": int(values.max()) if values.size else 0,
+                "percentiles": self.percentiles(metric),
+                "histogram": self.histogram(metric),
+                "outliers": self.outliers(metric, limit=outlier_limit),
+            }
+        return result
+
+
+def summarize_files(files, extract_rows=extract_function_metrics):
+    """Repository summary for a list of (filename, code) pairs.
+
+    `extract_rows(code)` returns the metric rows of one file; the API passes a worker
+    pool call so each file runs as its own job under the pool's limits. Anything but
+    a list of rows (None, a structured worker error) marks the file as skipped.
+    """
+    repo_metrics = RepositoryMetrics()
+    for filename, code_str in files:
+        if not filename.endswith(".py"):
+            continue
+        rows = extract_rows(code_str)
+        repo_metrics.add_rows(filename, rows if isinstance(rows, list) else None)
+    return repo_metrics.summary()
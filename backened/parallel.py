@@ -0,0 +1,158 @@
+import ast
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import utils
+from limits import ANALYSIS_WORKERS, apply_cpu_budget
+
+# Python files with at least this many lines are analyzed across a process pool
+PARALLEL_THRESHOLD_LINES = int(os.getenv("PARALLEL_ANALYSIS_THRESHOLD_LINES", 10000))
+# Every analysis worker may run its own pool, so share the cores out between them
+# (at least 2 per worker with the default ANALYSIS_WORKERS, on machines with 2+ cores)
+PARALLEL_WORKERS = max(min(
+    int(os.getenv("PARALLEL_ANALYSIS_WORKERS", os.cpu_count() or 2)),
+    (os.cpu_count() or 2) // ANALYSIS_WORKERS,
+), 1)
+CHUNKS_PER_WORKER = 4
+
+# Per-definition checks: name -> function returning the facts for one AST node
+FACT_FUNCTIONS = {
+    "naming": utils.naming_facts,
+    "modularity": utils.modularity_facts,
+    "docstrings": utils.docstring_facts,
+    "dry": utils.dry_facts,
+}
+
+# Per-chunk CPU budget in seconds; set by the analysis worker that owns the pool
+chunk_cpu_limit = None
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=PARALLEL_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _executor
+
+
+def _reset_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+    _executor = None
+
+
+def is_large_file(code_str):
+    # A single pool process would only add overhead over the serial path
+    return PARALLEL_WORKERS > 1 and code_str.count("\n") + 1 >= PARALLEL_THRESHOLD_LINES
+
+
+def _keyed_walk(tree, offset):
+    """Same order as ast.walk over the full module, with a (depth, path) sort key per node.
+
+    ast.walk is breadth-first, so its order is exactly the (depth, path-of-child-indices)
+    order. `offset` is the index of the chunk's first statement in the full module body.
+    """
+    todo = deque(((offset + i,), child) for i, child in enumerate(ast.iter_child_nodes(tree)))
+    while todo:
+        path, node = todo.popleft()
+        yield (len(path), path), node
+        todo.extend((path + (i,), child) for i, child in enumerate(ast.iter_child_nodes(node)))
+
+
+def _chunk_facts(chunk_source, offset, statement_count, cpu_limit=None):
+    """Run every per-definition check over one chunk of top-level statements."""
+    # Pool processes outlive single jobs, so the CPU budget is renewed per chunk
+    apply_cpu_budget(cpu_limit)
+    tree = ast.parse(chunk_source)
+    if len(tree.body) != statement_count:
+        raise ValueError("Chunk does not line up with top-level statements")
+
+    results = {name: [] for name in FACT_FUNCTIONS}
+    for key, node in _keyed_walk(tree, offset):
+        for name, fact_function in FACT_FUNCTIONS.items():
+            facts = fact_function(node)
+            if facts:
+                results[name].append((key, facts))
+    return results
+
+
+def _statement_start(node):
+    # Decorators sit above the `def`/`class` line
+    return min([node.lineno] + [decorator.lineno for decorator in getattr(node, "decorator_list", [])])
+
+
+def _split_top_level(tree, lines, chunk_count):
+    """Split the module into (source, offset, statement_count) chunks of roughly equal line counts."""
+    body = tree.body
+    target = max(len(lines) // chunk_count, 1)
+    chunks = []
+    start = 0
+    for i in range(1, len(body) + 1):
+        at_end = i == len(body)
+        # Only cut where the next statement starts on a new line (`a = 1; b = 2` stays together)
+        can_cut = at_end or _statement_start(body[i]) > body[i - 1].end_lineno
+        big_enough = body[i - 1].end_lineno - _statement_start(body[start]) + 1 >= target
+        if at_end or (can_cut and big_enough):
+            first_line = _statement_start(body[start])
+            last_line = body[i - 1].end_lineno
+            chunks.append(("\n".join(lines[first_line - 1:last_line]), start, i - start))
+            start = i
+    return chunks
+
+
+def analyze_python_parallel(code_str):
+    """Run the Python checks with per-definition work spread over a process pool.
+
+    Returns the same six section dicts as the serial path, in the same order, or
+    None if the file can't be split (syntax errors, odd line endings, broken pool),
+    in which case the caller should fall back to the serial checks.
+    """
+    try:
+        tree = ast.parse(code_str)
+    except SyntaxError:
+        return None
+    if not tree.body:
+        return None
+
+    lines = code_str.split("\n")
+    chunks = _split_top_level(tree, lines, PARALLEL_WORKERS * CHUNKS_PER_WORKER)
+    try:
+        executor = _get_executor()
+        futures = [executor.submit(_chunk_facts, *chunk, chunk_cpu_limit) for chunk in chunks]
+    except (BrokenProcessPool, RuntimeError):
+        _reset_executor()
+        return None
+
+    # File-level checks run here while the pool works through the definitions
+    formatting = utils.analyze_formatting_and_indentation(code_str)
+    best_practices = utils.analyze_web_dev_best_practices(code_str)
+
+    merged = {name: [] for name in FACT_FUNCTIONS}
+    try:
+        for future in futures:
+            for name, keyed_facts in future.result().items():
+                merged[name].extend(keyed_facts)
+    except BrokenProcessPool:
+        _reset_executor()
+        return None
+    except (SyntaxError, ValueError):
+        return None
+
+    # Restore the global ast.walk order across chunks
+    facts = {}
+    for name, keyed_facts in merged.items():
+        keyed_facts.sort(key=lambda item: item[0])
+        facts[name] = [fact for _, node_facts in keyed_facts for fact in node_facts]
+
+    return (
+        utils.naming_result(facts["naming"]),
+        utils.modularity_result(facts["modularity"]),
+        utils.docstring_result(ast.get_docstring(tree), facts["docstrings"]),
+        formatting,
+        utils.dry_result(facts["dry"]),
+        best_practices,
+    )
@@ -0,0 +1,124 @@
+"""Replay captured /analyze-code traffic and report throughput and latency percentiles.
+
+Usage:
+    python replay.py captures/requests.jsonl                       # in-process against main.app
+    python replay.py captures/requests.jsonl --url http://host:8000 --concurrency 16
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import httpx
+from capture import load_captures
+
+PERCENTILES = (50, 90, 95, 99)
+
+# Filler used when the capture kept metadata only (redaction="content")
+FILLER_LINES = {
+    "python": "value_{i} = {i}  # filler\n",
+    "javascript": "let value{i} = {i}; // filler\n",
+}
+
+
+def payload_for(entry):
+    """(filename, content) to send for a captured request; synthesized when content was redacted."""
+    if "content" in entry:
+        return entry["filename"], entry["content"]
+
+    template = FILLER_LINES.get(entry["language"], FILLER_LINES["python"])
+    lines = []
+    size = 0
+    i = 0
+    while size < entry["size"]:
+        line = template.format(i=i)
+        lines.append(line)
+        size += len(line)
+        i += 1
+    return entry["filename"], "".join(lines)
+
+
+def percentiles(values):
+    if not values:
+        return {f"p{p}": 0.0 for p in PERCENTILES}
+    if len(values) == 1:
+        return {f"p{p}": round(values[0], 3) for p in PERCENTILES}
+    cuts = statistics.quantiles(values, n=100, method="inclusive")
+    return {f"p{p}": round(cuts[p - 1], 3) for p in PERCENTILES}
+
+
+async def _send(client, entry, semaphore, latencies, statuses):
+    filename, content = payload_for(entry)
+    params = {key: value for key, value in entry.get("options", {}).items() if value is not None}
+    async with semaphore:
+        started = time.perf_counter()
+        try:
+            response = await client.post("/analyze-code", params=params, files={"file": (filename, content.encode("utf-8"))})
+            status = response.status_code
+        except httpx.HTTPError:
+            status = "connection_error"
+        latencies.append((time.perf_counter() - started) * 1000)
+    statuses[status] = statuses.get(status, 0) + 1
+
+
+async def _drive(client, entries, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+    statuses = {}
+    started = time.perf_counter()
+    await asyncio.gather(*(_send(client, entry, semaphore, latencies, statuses) for entry in entries))
+    return time.perf_counter() - started, latencies, statuses
+
+
+async def replay(entries, url=None, concurrency=4, timeout=300):
+    """Re-drive captured requests over HTTP (`url`) or in-process against main.app."""
+    if url:
+        async with httpx.AsyncClient(base_url=url, timeout=timeout) as client:
+            elapsed, latencies, statuses = await _drive(client, entries, concurrency)
+    else:
+        from main import app
+        # Run the app lifespan so the worker pool exists
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://replay", timeout=timeout) as client:
+                elapsed, latencies, statuses = await _drive(client, entries, concurrency)
+
+    return {
+        "requests": len(entries),
+        "concurrency": concurrency,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(entries) / elapsed, 3) if elapsed else 0.0,
+        "latency_ms": percentiles(sorted(latencies)),
+        "captured_latency_ms": percentiles(sorted(entry["duration_ms"] for entry in entries)),
+        "statuses": {str(status): count for status, count in statuses.items()},
+        "synthesized_payloads": sum("content" not in entry for entry in entries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("archive", help="JSON Lines capture file written by capture.RequestCapture")
+    parser.add_argument("--url", help="Base URL of a running server; omit to replay in-process")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the whole archive this many times")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    entries = load_captures(args.archive) * args.repeat
+    report = asyncio.run(replay(entries, url=args.url, concurrency=args.concurrency))
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Requests:    {report['requests']} at concurrency {report['concurrency']}")
+    print(f"Elapsed:     {report['elapsed_s']}s ({report['throughput_rps']} req/s)")
+    print("Latency ms:  " + ", ".join(f"{name}={value}" for name, value in report["latency_ms"].items()))
+    print("Captured ms: " + ", ".join(f"{name}={value}" for name, value in report["captured_latency_ms"].items()))
+    print("Statuses:    " + ", ".join(f"{status}: {count}" for status, count in report["statuses"].items()))
+    if report["synthesized_payloads"]:
+        print(f"Note: {report['synthesized_payloads']} payload(s) were synthesized from metadata-only captures.")
+
+
+if __name__ == "__main__":
+    main()
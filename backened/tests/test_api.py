@@ -0,0 +1,32 @@
+import pytest
+from fastapi.testclient import TestClient
+from main import app
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def test_analyze_code(client):
+    response = client.post("/analyze-code", files={"file": ("a.py", b"def add(a, b):\n    return a + b\n")})
+    assert response.status_code == 200
+    assert len(response.json()["metrics"]) == 6
+
+
+def test_analyze_code_structured_error(client):
+    response = client.post("/analyze-code", files={"file": ("a.txt", b"x")})
+    assert response.status_code == 400
+    assert response.json()["error_type"] == "invalid_input"
+
+
+def test_analyze_repository_survives_deep_expressions(client):
+    deep = ("x = " + "1+" * 200000 + "1\n").encode()
+    good = b"def f(x):\n    if x:\n        return 1\n    return 2\n"
+    response = client.post("/analyze-repository", files=[("files", ("deep.py", deep)), ("files", ("good.py", good))])
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["skipped_files"] == ["deep.py"]
+    assert summary["functions"] == 1
+    assert summary["metrics"]["complexity"]["max"] == 2
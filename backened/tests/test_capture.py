@@ -0,0 +1,56 @@
+import pytest
+from fastapi.testclient import TestClient
+import capture
+import main
+from capture import RequestCapture, load_captures, redact_secrets
+
+
+def test_unwritable_archive_does_not_raise(tmp_path):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    capture = RequestCapture(path=str(blocker / "requests.jsonl"), sample_rate=1)
+    capture.record("a.py", "x = 1\n", {"mode": "full"}, 200, 0.01)
+
+
+def test_capture_failure_keeps_the_response(tmp_path, monkeypatch):
+    blocker = tmp_path / "not_a_directory"
+    blocker.write_text("")
+    monkeypatch.setattr(main, "request_capture", RequestCapture(path=str(blocker / "requests.jsonl"), sample_rate=1))
+    with TestClient(main.app) as client:
+        response = client.post("/analyze-code", files={"file": ("a.py", b"def add(a, b):\n    return a + b\n")})
+    assert response.status_code == 200
+    assert "overall_score" in response.json()
+
+
+def test_redact_secrets_keeps_length():
+    content = 'api_key = "abcd1234"\nclient = make("sk-ABC123xyz")\npassword: \'hunter2\'\nname = "alice"\n'
+    redacted = redact_secrets(content)
+    assert len(redacted) == len(content)
+    for secret in ("abcd1234", "sk-ABC123xyz", "hunter2"):
+        assert secret not in redacted
+    assert 'name = "alice"' in redacted
+
+
+def test_sample_rate_gates_capture(monkeypatch):
+    assert not RequestCapture(sample_rate=0).should_capture()
+    assert RequestCapture(sample_rate=1).should_capture()
+    monkeypatch.setattr(capture.random, "random", lambda: 0.4)
+    assert RequestCapture(sample_rate=0.5).should_capture()
+    assert not RequestCapture(sample_rate=0.3).should_capture()
+
+
+def test_invalid_redaction_mode():
+    with pytest.raises(ValueError):
+        RequestCapture(redaction="everything")
+
+
+def test_content_redaction_keeps_metadata_only(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    code = 'token = "abc"\nx = 1\n'
+    RequestCapture(path=str(path), sample_rate=1, redaction="content").record("secret_name.py", code, {"mode": "full"}, 200, 0.25)
+    [entry] = load_captures(str(path))
+    assert "content" not in entry
+    assert entry["filename"] == "upload.py"
+    assert entry["size"] == len(code)
+    assert entry["lines"] == 3
+    assert entry["duration_ms"] == 250.0
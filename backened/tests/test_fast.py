@@ -0,0 +1,69 @@
+import time
+import pytest
+from analyzer import analyze_code
+from benchmark_parallel import generate_module
+
+LATENCY_BUDGET = 0.1
+
+
+def big_class(n):
+    methods = "".join(
+        f"    def method_{i}(self, x):\n        \"\"\"Do thing {i}.\"\"\"\n        if x > {i}:\n            return x * {i}  # scaled\n        return x\n\n"
+        for i in range(n)
+    )
+    return '"""Module."""\nimport os\n\nclass Big:\n    """Big class."""\n' + methods
+
+
+def one_undocumented_function(n):
+    documented = "".join(f"def f{i}(x):\n    \"\"\"Return x plus {i}.\"\"\"\n    y = x + {i}  # add\n    return y\n\n" for i in range(n))
+    return '"""Module docstring here."""\n' + documented + "def undocumented(x):\n    return x\n"
+
+
+def one_long_function(n):
+    long_function = "def process(a):\n" + "".join(f"    a = a + {i}\n" for i in range(30)) + "    return a\n"
+    return '"""Module docstring here."""\n' + long_function + "".join(f"value_{i} = {i}\n" for i in range(n))
+
+
+def minified_js(n):
+    return "".join(f"function f{i}(a){{var b=a+{i};if(b>2){{return b}}return a}};" for i in range(n))
+
+
+def generated_js(n):
+    return "\n".join(f"function doThing{i}(a, b) {{\n    // add\n    if (a) {{ return a + b; }}\n    return b;\n}}\nconst VALUE_{i} = {i};\n" for i in range(n))
+
+
+CASES = [
+    ("module.py", generate_module(500)),
+    ("big_class.py", big_class(3000)),
+    ("one_undocumented.py", one_undocumented_function(5000)),
+    ("one_long_function.py", one_long_function(50000)),
+    ("minified.js", minified_js(8000)),
+    ("generated.js", generated_js(2000)),
+]
+
+
+@pytest.mark.parametrize("filename, code", CASES, ids=[name for name, _ in CASES])
+def test_full_score_within_bounds(filename, code):
+    started = time.perf_counter()
+    fast = analyze_code(filename, code, mode="fast", latency_budget=LATENCY_BUDGET)
+    fast_elapsed = time.perf_counter() - started
+    started = time.perf_counter()
+    full = analyze_code(filename, code)
+    full_elapsed = time.perf_counter() - started
+
+    # Over budget, so it must be a sampled estimate, never the full analysis
+    assert fast["approximate"]
+    assert fast["sample"]["chars"] < fast["sample"]["total_chars"] / 4
+    assert fast_elapsed < full_elapsed
+
+    low, high = fast["overall_confidence_interval"]
+    assert low <= fast["overall_score"] <= high
+    assert low <= full["overall_score"] <= high
+    for fast_metric, full_metric in zip(fast["metrics"], full["metrics"]):
+        low, high = fast_metric["confidence_interval"]
+        assert low <= full_metric["score"] <= high, fast_metric["name"]
+
+
+def test_small_file_is_analyzed_in_full():
+    code = "def add(a, b):\n    return a + b\n"
+    assert analyze_code("a.py", code, mode="fast") == analyze_code("a.py", code)
@@ -0,0 +1,54 @@
+import pytest
+from fastapi import FastAPI, WebSocket
+from fastapi.testclient import TestClient
+from live import LiveAnalysisSession
+from workers import AnalysisWorkerPool
+
+
+def make_client(pool):
+    app = FastAPI()
+
+    @app.websocket("/ws")
+    async def endpoint(websocket: WebSocket):
+        await LiveAnalysisSession(websocket, pool, debounce=0.1).run()
+
+    return TestClient(app)
+
+
+@pytest.fixture(scope="module")
+def pool():
+    pool = AnalysisWorkerPool(workers=1, timeout=30)
+    yield pool
+    pool.close()
+
+
+def test_rapid_updates_only_return_latest(pool):
+    with make_client(pool).websocket_connect("/ws") as ws:
+        for i in range(5):
+            ws.send_json({"filename": "a.py", "content": f"value_{i} = {i}\n"})
+        result = ws.receive_json()
+        assert result["version"] == 5
+        assert "overall_score" in result
+
+
+def test_invalid_message(pool):
+    with make_client(pool).websocket_connect("/ws") as ws:
+        ws.send_text("not json")
+        assert ws.receive_json()["error_type"] == "invalid_message"
+
+
+def test_binary_frame_is_invalid_message(pool):
+    with make_client(pool).websocket_connect("/ws") as ws:
+        ws.send_bytes(b'{"filename": "a.py", "content": "x = 1\\n"}')
+        assert ws.receive_json()["error_type"] == "invalid_message"
+        # The session stays usable afterwards
+        ws.send_json({"filename": "a.py", "content": "x = 1\n"})
+        assert ws.receive_json()["version"] == 1
+
+
+def test_pool_failure_sends_error_frame():
+    with make_client(None).websocket_connect("/ws") as ws:
+        ws.send_json({"filename": "a.py", "content": "x = 1\n"})
+        result = ws.receive_json()
+        assert result["version"] == 1
+        assert result["error_type"] == "analysis_failed"
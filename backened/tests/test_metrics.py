@@ -0,0 +1,76 @@
+import ast
+from functools import partial
+import utils
+import worker_jobs
+from metrics import RepositoryMetrics, extract_function_metrics, summarize_files
+from workers import AnalysisWorkerPool
+
+NESTED = '''
+def outer(x):
+    if x:
+        return 1
+    def inner(y):
+        if y and y > 1:
+            return 2
+        return 3
+    return inner
+
+async def fetch(url):
+    for attempt in range(3):
+        if attempt:
+            pass
+'''
+
+
+def test_complexity_excludes_nested_definitions():
+    rows = {row[0]: row for row in extract_function_metrics(NESTED)}
+    assert rows["outer"][5] == 2
+    assert rows["inner"][5] == 3
+
+
+def test_async_functions_are_collected():
+    rows = {row[0]: row for row in extract_function_metrics(NESTED)}
+    assert rows["fetch"][5] == 3
+
+
+def test_walk_own_body_stops_at_classes():
+    tree = ast.parse("def f():\n    class C:\n        def g(self):\n            pass\n")
+    names = {type(node).__name__ for node in utils.walk_own_body(tree.body[0])}
+    assert "ClassDef" in names
+    assert "FunctionDef" not in names
+
+
+def test_unparseable_files_are_skipped():
+    repo = RepositoryMetrics()
+    assert repo.add_file("deep.py", "x = " + "1+" * 200000 + "1\n") == 0
+    assert repo.add_file("broken.py", "def (:\n") == 0
+    assert repo.add_file("ok.py", NESTED) == 3
+    summary = repo.summary()
+    assert summary["skipped_files"] == ["deep.py", "broken.py"]
+    assert summary["files"] == 1
+    assert summary["functions"] == 3
+
+
+def test_percentiles_and_outliers():
+    repo = RepositoryMetrics()
+    simple = "".join(f"def f{i}():\n    return {i}\n" for i in range(20))
+    complex_function = "def big(x):\n" + "".join(f"    if x == {i}:\n        return {i}\n" for i in range(30))
+    repo.add_file("a.py", simple + complex_function)
+    assert repo.percentiles("complexity")["p50"] == 1.0
+    outliers = repo.outliers("complexity")
+    assert [o["function"] for o in outliers] == ["big"]
+    assert outliers[0]["value"] == 31
+    assert sum(repo.histogram("complexity", bins=5)["counts"]) == 21
+
+
+def test_repository_limits_apply_per_file():
+    # Four half-second files take longer than the timeout together, but not one by one
+    pool = AnalysisWorkerPool(workers=1, timeout=1.5)
+    try:
+        files = [(f"f{i}.py", NESTED) for i in range(4)] + [("notes.txt", "x"), ("broken.py", "def (:\n")]
+        summary = summarize_files(files, partial(pool.call, worker_jobs.slow_function_metrics))
+    finally:
+        pool.close()
+    assert summary["files"] == 4
+    assert summary["functions"] == 12
+    assert summary["skipped_files"] == ["broken.py"]
@@ -0,0 +1,63 @@
+import importlib
+import os
+import signal
+import pytest
+import limits
+import parallel
+import worker_jobs
+from benchmark_parallel import generate_module, run_serial
+from workers import AnalysisWorkerPool, resource
+
+
+def test_parallel_matches_serial():
+    code = generate_module(300)
+    assert parallel.analyze_python_parallel(code) == run_serial(code)
+
+
+def test_pool_recovers_after_process_dies():
+    code = generate_module(50)
+    expected = run_serial(code)
+    assert parallel.analyze_python_parallel(code) == expected
+
+    broken = parallel._executor
+    process = next(iter(broken._processes.values()))
+    os.kill(process.pid, signal.SIGKILL)
+    process.join()
+
+    # The call that finds the broken pool may fall back, the next one must run in parallel again
+    parallel.analyze_python_parallel(code)
+    assert parallel.analyze_python_parallel(code) == expected
+    assert parallel._executor is not broken
+
+
+def test_parallel_declines_syntax_errors():
+    assert parallel.analyze_python_parallel("def (:\n") is None
+
+
+def test_pool_size_is_capped():
+    assert 1 <= parallel.PARALLEL_WORKERS <= max(parallel.os.cpu_count() // parallel.ANALYSIS_WORKERS, 1)
+
+
+def test_parallel_path_on_by_default(monkeypatch):
+    monkeypatch.delenv("ANALYSIS_WORKERS", raising=False)
+    monkeypatch.delenv("PARALLEL_ANALYSIS_WORKERS", raising=False)
+    monkeypatch.setattr(os, "cpu_count", lambda: 8)
+    try:
+        importlib.reload(limits)
+        importlib.reload(parallel)
+        assert parallel.PARALLEL_WORKERS > 1
+        assert parallel.is_large_file("x = 1\n" * parallel.PARALLEL_THRESHOLD_LINES)
+    finally:
+        monkeypatch.undo()
+        importlib.reload(limits)
+        importlib.reload(parallel)
+
+
+@pytest.mark.skipif(resource is None, reason="rlimits need the resource module")
+def test_chunk_renews_cpu_budget():
+    pool = AnalysisWorkerPool(workers=1, timeout=30, cpu_limit=3)
+    try:
+        result = pool.call(worker_jobs.cpu_soft_limit_after_chunk, 7)
+    finally:
+        pool.close()
+    assert result["soft"] == int(result["used"]) + 7 + 1
@@ -0,0 +1,26 @@
+import asyncio
+from capture import RequestCapture, load_captures
+from replay import payload_for, replay
+
+
+def test_payload_is_synthesized_for_metadata_only_entries():
+    filename, content = payload_for({"filename": "upload.py", "language": "python", "size": 500})
+    assert filename == "upload.py"
+    assert len(content) >= 500
+    assert content.startswith("value_0 = 0")
+
+
+def test_replay_in_process(tmp_path):
+    path = tmp_path / "requests.jsonl"
+    code = "def add(a, b):\n    return a + b\n"
+    RequestCapture(path=str(path), sample_rate=1, redaction="none").record("a.py", code, {"mode": "full", "latency_budget": None}, 200, 0.01)
+    RequestCapture(path=str(path), sample_rate=1, redaction="content").record("b.py", code, {"mode": "full"}, 200, 0.02)
+    RequestCapture(path=str(path), sample_rate=1, redaction="none").record("c.txt", "x", {"mode": "full"}, 400, 0.03)
+
+    report = asyncio.run(replay(load_captures(str(path)), concurrency=2))
+    assert report["requests"] == 3
+    assert report["statuses"] == {"200": 2, "400": 1}
+    assert report["synthesized_payloads"] == 1
+    assert set(report["latency_ms"]) == {"p50", "p90", "p95", "p99"}
+    assert report["captured_latency_ms"]["p50"] == 20.0
+    assert report["throughput_rps"] > 0
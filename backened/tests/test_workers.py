@@ -0,0 +1,119 @@
+import threading
+import time
+import pytest
+import worker_jobs
+from workers import AnalysisWorkerPool, resource
+
+GOOD_CODE = "def add(a, b):\n    return a + b\n"
+posix_only = pytest.mark.skipif(resource is None, reason="rlimits need the resource module")
+
+
+@pytest.fixture
+def make_pool():
+    pools = []
+
+    def factory(**kwargs):
+        pool = AnalysisWorkerPool(workers=1, **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield factory
+    for pool in pools:
+        pool.close()
+
+
+def assert_pool_recovered(pool):
+    # The replacement worker must serve the next job normally
+    assert "overall_score" in pool.run("ok.py", GOOD_CODE)
+
+
+def test_analysis_result(make_pool):
+    pool = make_pool(timeout=30)
+    result = pool.run("ok.py", GOOD_CODE)
+    assert result["overall_score"] > 0
+    assert len(result["metrics"]) == 6
+
+
+def test_unsupported_language_is_invalid_input(make_pool):
+    pool = make_pool(timeout=30)
+    assert pool.run("notes.txt", "hello")["error_type"] == "invalid_input"
+    assert pool.run("broken.py", "def (:\n")["error_type"] == "invalid_input"
+    assert pool.run("ok.py", GOOD_CODE, mode="bogus")["error_type"] == "invalid_input"
+
+
+def test_recursion_error_is_structured(make_pool):
+    pool = make_pool(timeout=30, recursion_limit=200)
+    result = pool.call(worker_jobs.recurse)
+    assert result == {"error": "Code is nested too deeply to analyze.", "error_type": "recursion_limit"}
+    assert_pool_recovered(pool)
+
+
+def test_timeout_replaces_worker(make_pool):
+    pool = make_pool(timeout=0.5)
+    started = time.monotonic()
+    assert pool.call(worker_jobs.sleep, 30)["error_type"] == "timeout"
+    assert time.monotonic() - started < 10
+    pool.timeout = 30
+    assert_pool_recovered(pool)
+
+
+@posix_only
+def test_cpu_limit_replaces_worker(make_pool):
+    pool = make_pool(timeout=60, cpu_limit=1)
+    assert pool.call(worker_jobs.spin)["error_type"] == "cpu_limit"
+    assert_pool_recovered(pool)
+
+
+def test_crashed_worker_is_replaced(make_pool):
+    pool = make_pool(timeout=30)
+    result = pool.call(worker_jobs.exit_with, 3)
+    assert result["error_type"] == "worker_crashed"
+    assert "exit code 3" in result["error"]
+    assert_pool_recovered(pool)
+
+
+def test_worker_killed_while_idle_is_replaced_before_the_next_job(make_pool):
+    pool = make_pool(timeout=30)
+    idle = pool._workers[0]
+    idle.process.kill()
+    idle.process.join()
+    assert "overall_score" in pool.run("ok.py", GOOD_CODE)
+    assert pool._workers[0] is not idle
+
+
+@posix_only
+def test_segfault_is_reported_as_recursion_limit(make_pool):
+    pool = make_pool(timeout=30)
+    assert pool.call(worker_jobs.segfault)["error_type"] == "recursion_limit"
+    assert_pool_recovered(pool)
+
+
+def test_cancel_stops_running_job(make_pool):
+    pool = make_pool(timeout=30)
+    cancel_event = threading.Event()
+    threading.Timer(0.3, cancel_event.set).start()
+    started = time.monotonic()
+    assert pool.call(worker_jobs.sleep, 30, cancel_event=cancel_event)["error_type"] == "cancelled"
+    assert time.monotonic() - started < 10
+    assert_pool_recovered(pool)
+
+
+def test_closed_pool_refuses_jobs(make_pool):
+    pool = make_pool(timeout=30)
+    pool.close()
+    with pytest.raises(RuntimeError):
+        pool.run("ok.py", GOOD_CODE)
+
+
+def test_cancel_while_waiting_for_a_worker(make_pool):
+    pool = make_pool(timeout=30)
+    busy = threading.Thread(target=pool.call, args=(worker_jobs.sleep, 2))
+    busy.start()
+    time.sleep(0.2)
+    cancel_event = threading.Event()
+    threading.Timer(0.2, cancel_event.set).start()
+    started = time.monotonic()
+    assert pool.run("ok.py", GOOD_CODE, cancel_event=cancel_event)["error_type"] == "cancelled"
+    # Returned as soon as it was cancelled, not when the busy worker freed up
+    assert time.monotonic() - started < 1
+    busy.join()
@@ -0,0 +1,42 @@
+"""Jobs for the worker pool tests; spawned workers import them by module name."""
+import os
+import signal
+import time
+
+
+def spin():
+    while True:
+        pass
+
+
+def sleep(seconds):
+    time.sleep(seconds)
+    return {"slept": seconds}
+
+
+def exit_with(code):
+    os._exit(code)
+
+
+def segfault():
+    os.kill(os.getpid(), signal.SIGSEGV)
+
+
+def recurse(depth=0):
+    return recurse(depth + 1)
+
+
+def slow_function_metrics(code):
+    """extract_function_metrics for one file, taking half a second longer."""
+    from metrics import extract_function_metrics
+    time.sleep(0.5)
+    return extract_function_metrics(code)
+
+
+def cpu_soft_limit_after_chunk(cpu_limit):
+    """Run a parallel-analysis chunk here and report the CPU rlimit it leaves behind."""
+    import resource
+    import parallel
+    parallel._chunk_facts("x = 1\n", 0, 1, cpu_limit)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return {"soft": resource.getrlimit(resource.RLIMIT_CPU)[0], "used": usage.ru_utime + usage.ru_stime}
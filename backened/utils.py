@@ -19,46 +19,44 @@ def to_upper_case(name):
     """Convert a given name to UPPER_CASE."""
     return name.upper()
 
-def check_naming_conventions_from_string(code_str):
-    try:
-        tree = ast.parse(code_str)
-    except SyntaxError as e:
-        return {"error": f"Syntax error in the provided code: {e}"}
-
-    errors = []
-    total_checks = 0
-    incorrect_count = 0
-
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):  # Function names
-            total_checks += 1
-            if not SNAKE_CASE_PATTERN.match(node.name):
-                incorrect_count += 1
-                suggested_name = to_snake_case(node.name)
-                errors.append(f"Function `{node.name}` → Suggested: `{suggested_name}`")
-
-        elif isinstance(node, ast.ClassDef):  # Class names
-            total_checks += 1
-            if not PASCAL_CASE_PATTERN.match(node.name):
-                incorrect_count += 1
-                suggested_name = to_pascal_case(node.name)
-                errors.append(f"Class `{node.name}` → Suggested: `{suggested_name}`")
-
-        elif isinstance(node, ast.Assign):  # Variables/constants
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    var_name = target.id
-                    total_checks += 1
-                    if var_name.isupper():  # Constant should be UPPER_CASE
-                        if not UPPER_CASE_PATTERN.match(var_name):
-                            incorrect_count += 1
-                            suggested_name = to_upper_case(var_name)
-                            errors.append(f"Constant `{var_name}` → Suggested: `{suggested_name}`")
-                    else:  # Variable should be in snake_case
-                        if not SNAKE_CASE_PATTERN.match(var_name):
-                            incorrect_count += 1
-                            suggested_name = to_snake_case(var_name)
-                            errors.append(f"Variable `{var_name}` → Suggested: `{suggested_name}`")
+def naming_facts(node):
+    """Naming checks for one AST node: one entry per name, the issue message or None if it's fine."""
+    facts = []
+    if isinstance(node, ast.FunctionDef):  # Function names
+        if not SNAKE_CASE_PATTERN.match(node.name):
+            suggested_name = to_snake_case(node.name)
+            facts.append(f"Function `{node.name}` → Suggested: `{suggested_name}`")
+        else:
+            facts.append(None)
+
+    elif isinstance(node, ast.ClassDef):  # Class names
+        if not PASCAL_CASE_PATTERN.match(node.name):
+            suggested_name = to_pascal_case(node.name)
+            facts.append(f"Class `{node.name}` → Suggested: `{suggested_name}`")
+        else:
+            facts.append(None)
+
+    elif isinstance(node, ast.Assign):  # Variables/constants
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                var_name = target.id
+                issue = None
+                if var_name.isupper():  # Constant should be UPPER_CASE
+                    if not UPPER_CASE_PATTERN.match(var_name):
+                        suggested_name = to_upper_case(var_name)
+                        issue = f"Constant `{var_name}` → Suggested: `{suggested_name}`"
+                else:  # Variable should be in snake_case
+                    if not SNAKE_CASE_PATTERN.match(var_name):
+                        suggested_name = to_snake_case(var_name)
+                        issue = f"Variable `{var_name}` → Suggested: `{suggested_name}`"
+                facts.append(issue)
+
+    return facts
+
+def naming_result(facts):
+    errors = [issue for issue in facts if issue is not None]
+    total_checks = len(facts)
+    incorrect_count = len(errors)
 
     # Calculate score
     score = round(10 * (1 - incorrect_count / total_checks)) if total_checks > 0 else 10
@@ -68,38 +66,76 @@ def check_naming_conventions_from_string(code_str):
         "issues": errors if errors else ["All naming conventions are correct!"]
     }
 
-import ast
-
-def analyze_function_length_and_modularity(code_str):
+def check_naming_conventions_from_string(code_str):
     try:
         tree = ast.parse(code_str)
     except SyntaxError as e:
         return {"error": f"Syntax error in the provided code: {e}"}
 
+    facts = [fact for node in ast.walk(tree) for fact in naming_facts(node)]
+    return naming_result(facts)
+
+import ast
+
+def count_function_constructs(node):
+    """Count the loops, conditions and calls inside a function node."""
+    loop_count = sum(isinstance(n, (ast.For, ast.While)) for n in ast.walk(node))
+    condition_count = sum(isinstance(n, (ast.If, ast.Match)) for n in ast.walk(node))
+    function_call_count = sum(isinstance(n, ast.Call) for n in ast.walk(node))
+    return loop_count, condition_count, function_call_count
+
+def walk_own_body(node):
+    """Like ast.walk, but doesn't descend into nested function or class definitions."""
+    todo = list(ast.iter_child_nodes(node))
+    while todo:
+        child = todo.pop()
+        yield child
+        if not isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            todo.extend(ast.iter_child_nodes(child))
+
+def cyclomatic_complexity(node):
+    """McCabe complexity of a function: 1 + number of decision points.
+
+    Nested functions and classes are left out; they get their own complexity.
+    """
+    complexity = 1
+    for n in walk_own_body(node):
+        if isinstance(n, (ast.If, ast.IfExp, ast.For, ast.While, ast.ExceptHandler, ast.Assert)):
+            complexity += 1
+        elif isinstance(n, ast.BoolOp):
+            # `a and b and c` adds one branch per extra operand
+            complexity += len(n.values) - 1
+        elif isinstance(n, ast.comprehension):
+            complexity += 1 + len(n.ifs)
+        elif isinstance(n, ast.match_case):
+            complexity += 1
+    return complexity
+
+def modularity_facts(node):
+    """(name, length, loops, conditions, calls) for a function node, nothing for other nodes."""
+    if not isinstance(node, ast.FunctionDef):
+        return []
+    loop_count, condition_count, function_call_count = count_function_constructs(node)
+    return [(node.name, len(node.body), loop_count, condition_count, function_call_count)]
+
+def modularity_result(facts):
     function_issues = []
     total_functions = 0
     long_functions = 0
     multi_task_functions = 0
 
-    for node in ast.walk(tree):
-        if isinstance(node, ast.FunctionDef):
-            total_functions += 1
-            function_name = node.name
-            function_length = len(node.body)
-
-            # Check if function is too long (>20 lines)
-            if function_length > 20:
-                long_functions += 1
-                function_issues.append(f"Function `{function_name}` is too long ({function_length} lines). Consider breaking it down.")
+    for function_name, function_length, loop_count, condition_count, function_call_count in facts:
+        total_functions += 1
 
-            # Check if function does multiple tasks (heuristic: too many loops/conditions)
-            loop_count = sum(isinstance(n, (ast.For, ast.While)) for n in ast.walk(node))
-            condition_count = sum(isinstance(n, (ast.If, ast.Match)) for n in ast.walk(node))
-            function_call_count = sum(isinstance(n, ast.Call) for n in ast.walk(node))
+        # Check if function is too long (>20 lines)
+        if function_length > 20:
+            long_functions += 1
+            function_issues.append(f"Function `{function_name}` is too long ({function_length} lines). Consider breaking it down.")
 
-            if loop_count + condition_count > 3 and function_call_count > 3:
-                multi_task_functions += 1
-                function_issues.append(f"Function `{function_name}` seems to perform multiple tasks. Consider splitting it into separate functions.")
+        # Check if function does multiple tasks (heuristic: too many loops/conditions)
+        if loop_count + condition_count > 3 and function_call_count > 3:
+            multi_task_functions += 1
+            function_issues.append(f"Function `{function_name}` seems to perform multiple tasks. Consider splitting it into separate functions.")
 
     # If no functions exist, score is 0
     if total_functions == 0:
@@ -119,48 +155,61 @@ def analyze_function_length_and_modularity(code_str):
         "issues": function_issues
     }
 
-import ast
-
-def analyze_comments_and_docstrings(code_str):
+def analyze_function_length_and_modularity(code_str):
     try:
         tree = ast.parse(code_str)
     except SyntaxError as e:
         return {"error": f"Syntax error in the provided code: {e}"}
 
+    facts = [fact for node in ast.walk(tree) for fact in modularity_facts(node)]
+    return modularity_result(facts)
+
+import ast
+
+def docstring_facts(node):
+    """("function", name, has_docstring) for functions, ("inline",) for commentable statements."""
+    # Check function-level docstrings
+    if isinstance(node, ast.FunctionDef):
+        docstring = ast.get_docstring(node)
+        # Ensure docstring is meaningful
+        return [("function", node.name, bool(docstring and len(docstring.strip()) >= 10))]
+
+    # Check inline comments
+    elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Str):
+        # Skip strings used as standalone expressions (often docstrings)
+        return []
+
+    elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+        # Skip constant string expressions (like module docstrings)
+        return []
+
+    elif isinstance(node, ast.Assign) or isinstance(node, ast.For) or isinstance(node, ast.If):
+        # Look for comments right after code lines
+        if hasattr(node, "lineno") and hasattr(node, "col_offset"):
+            return [("inline",)]
+
+    return []
+
+def docstring_result(module_docstring, facts):
     issues = []
     total_functions = 0
     functions_with_docstrings = 0
     inline_comments = 0
 
     # Check for a module-level docstring (at the top of the file)
-    module_docstring = ast.get_docstring(tree)
     if not module_docstring or len(module_docstring.strip()) < 10:  # Ensure it's not empty or too short
         issues.append("Missing or insufficient module-level docstring.")
 
-    for node in ast.walk(tree):
-        # Check function-level docstrings
-        if isinstance(node, ast.FunctionDef):
+    for fact in facts:
+        if fact[0] == "function":
+            _, name, has_docstring = fact
             total_functions += 1
-            docstring = ast.get_docstring(node)
-
-            if docstring and len(docstring.strip()) >= 10:  # Ensure docstring is meaningful
+            if has_docstring:
                 functions_with_docstrings += 1
             else:
-                issues.append(f"Function `{node.name}` is missing a proper docstring.")
-
-        # Check inline comments
-        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Str):
-            # Skip strings used as standalone expressions (often docstrings)
-            continue
-
-        elif isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
-            # Skip constant string expressions (like module docstrings)
-            continue
-
-        elif isinstance(node, ast.Assign) or isinstance(node, ast.For) or isinstance(node, ast.If):
-            # Look for comments right after code lines
-            if hasattr(node, "lineno") and hasattr(node, "col_offset"):
-                inline_comments += 1
+                issues.append(f"Function `{name}` is missing a proper docstring.")
+        else:
+            inline_comments += 1
 
     # Scoring System
     score = 20  # Start with full score
@@ -192,10 +241,19 @@ def analyze_comments_and_docstrings(code_str):
         "issues": issues if issues else ["Good documentation and comments!"]
     }
 
+def analyze_comments_and_docstrings(code_str):
+    try:
+        tree = ast.parse(code_str)
+    except SyntaxError as e:
+        return {"error": f"Syntax error in the provided code: {e}"}
+
+    facts = [fact for node in ast.walk(tree) for fact in docstring_facts(node)]
+    return docstring_result(ast.get_docstring(tree), facts)
+
 import ast
 import re
 
-def analyze_formatting_and_indentation(code_str):
+def analyze_formatting_and_indentation(code_str, check_parse=True):
     issues = []
     score = 15  # Start with full score
 
@@ -209,12 +267,13 @@ def analyze_formatting_and_indentation(code_str):
         issues.append("Mixed indentation detected (Tabs and Spaces). Use spaces only.")
         score -= 5
 
-    # Check for indentation errors using AST
-    try:
-        ast.parse(code_str)
-    except IndentationError as e:
-        issues.append(f"Indentation error: {str(e)}")
-        score -= 5
+    # Check for indentation errors using AST (skipped for a plain text scan)
+    if check_parse:
+        try:
+            ast.parse(code_str)
+        except IndentationError as e:
+            issues.append(f"Indentation error: {str(e)}")
+            score -= 5
 
     # Check for trailing whitespaces
     trailing_whitespace_lines = [i+1 for i, line in enumerate(lines) if line.rstrip() != line]
@@ -237,32 +296,39 @@ def analyze_formatting_and_indentation(code_str):
     }
 
 import ast
+import hashlib
 import re
 from collections import Counter
 
-def analyze_reusability_and_dry(code_str):
-    try:
-        tree = ast.parse(code_str)
-    except SyntaxError as e:
-        return {"error": f"Syntax error in the provided code: {e}"}
+def dry_facts(node):
+    """("function", name, body_hash, body_lines) for functions, ("constant", value) for hardcoded values."""
+    # Check for function definitions and hash their bodies to find repeats
+    if isinstance(node, ast.FunctionDef):
+        func_body = ast.unparse(node.body) if hasattr(ast, "unparse") else ""
+        body_hash = hashlib.sha1(func_body.encode("utf-8", "surrogatepass")).hexdigest()
+        return [("function", node.name, body_hash, len(func_body.split("\n")))]
+
+    # Check for hardcoded values
+    elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) and len(str(node.value)) > 2:
+        return [("constant", node.value)]
+
+    return []
 
+def dry_result(facts):
     issues = []
     score = 15  # Start with full score
 
     functions = {}
     repeated_code = Counter()
     hardcoded_values = Counter()
-    
-    for node in ast.walk(tree):
-        # Check for function definitions and count similar functions
-        if isinstance(node, ast.FunctionDef):
-            func_body = ast.unparse(node.body) if hasattr(ast, "unparse") else ""
-            functions[node.name] = func_body
-            repeated_code[func_body] += 1
 
-        # Check for hardcoded values
-        elif isinstance(node, ast.Constant) and isinstance(node.value, (int, float, str)) and len(str(node.value)) > 2:
-            hardcoded_values[node.value] += 1
+    for fact in facts:
+        if fact[0] == "function":
+            _, name, body_hash, body_lines = fact
+            functions[name] = body_lines
+            repeated_code[body_hash] += 1
+        else:
+            hardcoded_values[fact[1]] += 1
 
     # Deduct points for repeated functions (violating DRY)
     repeated_functions = [func for func, count in repeated_code.items() if count > 1]
@@ -276,10 +342,12 @@ def analyze_reusability_and_dry(code_str):
         score -= 5
 
     # Check for large functions doing multiple tasks (poor modularity)
-    for func_name, func_body in functions.items():
-        if len(func_body.split("\n")) > 20:  # If function is too long (>20 lines)
+    long_functions = 0
+    for func_name, body_lines in functions.items():
+        if body_lines > 20:  # If function is too long (>20 lines)
             issues.append(f"Function '{func_name}' is too long. Consider breaking it into smaller functions.")
             score -= 5
+            long_functions += 1
 
     # Ensure score is within 0-15
     score = max(score, 0)
@@ -290,9 +358,19 @@ def analyze_reusability_and_dry(code_str):
 
     return {
         "score": score,
-        "issues": issues
+        "issues": issues,
+        "long_functions": long_functions  # Per-function deductions, used by fast mode
     }
 
+def analyze_reusability_and_dry(code_str):
+    try:
+        tree = ast.parse(code_str)
+    except SyntaxError as e:
+        return {"error": f"Syntax error in the provided code: {e}"}
+
+    facts = [fact for node in ast.walk(tree) for fact in dry_facts(node)]
+    return dry_result(facts)
+
 import ast
 import re
 
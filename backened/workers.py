@@ -0,0 +1,215 @@
+import atexit
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import parallel
+from analyzer import analyze_code
+from limits import ANALYSIS_WORKERS, apply_cpu_budget, apply_memory_limit, resource
+
+# Defaults, overridable through environment variables
+DEFAULT_WORKERS = ANALYSIS_WORKERS
+DEFAULT_MEMORY_LIMIT_MB = int(os.getenv("ANALYSIS_MEMORY_LIMIT_MB", 1024))
+DEFAULT_CPU_LIMIT = int(os.getenv("ANALYSIS_CPU_LIMIT", 10))
+DEFAULT_TIMEOUT = float(os.getenv("ANALYSIS_TIMEOUT", 30))
+DEFAULT_RECURSION_LIMIT = int(os.getenv("ANALYSIS_RECURSION_LIMIT", 2000))
+
+# How often a cancellable job checks whether it has been cancelled (seconds)
+CANCEL_POLL_INTERVAL = 0.05
+
+
+def _error(error_type, message):
+    return {"error": message, "error_type": error_type}
+
+
+def _worker_main(conn, memory_limit_mb, cpu_limit, recursion_limit):
+    """Worker process loop: receive (function, args, kwargs) jobs and send back results."""
+    if hasattr(os, "setsid"):
+        # Own process group, so killing the worker also kills its parallel analysis pool
+        os.setsid()
+    apply_memory_limit(memory_limit_mb)
+    sys.setrecursionlimit(recursion_limit)
+    # Chunks sent to the parallel analysis pool get the same per-job CPU budget
+    parallel.chunk_cpu_limit = cpu_limit
+
+    while True:
+        try:
+            job = conn.recv()
+        except (EOFError, OSError):
+            break
+        if job is None:  # Shutdown signal
+            break
+
+        function, args, kwargs = job
+        apply_cpu_budget(cpu_limit)
+        try:
+            reply = function(*args, **kwargs)
+        except (ValueError, SyntaxError) as e:
+            reply = _error("invalid_input", str(e))
+        except RecursionError:
+            reply = _error("recursion_limit", "Code is nested too deeply to analyze.")
+        except MemoryError:
+            reply = _error("memory_limit", "Analysis exceeded the memory limit.")
+        except Exception as e:
+            reply = _error("analysis_failed", f"Analysis failed: {e}")
+        conn.send(reply)
+
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+
+
+class AnalysisWorkerPool:
+    """Supervised pool of analysis processes with per-job resource limits.
+
+    Each job runs in a long-lived worker under an address-space rlimit, a per-job
+    CPU-seconds budget and a recursion limit. A worker that crashes or overruns the
+    wall-clock timeout is killed and replaced, and the caller gets a structured error.
+    """
+
+    def __init__(self, workers=DEFAULT_WORKERS, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB,
+                 cpu_limit=DEFAULT_CPU_LIMIT, timeout=DEFAULT_TIMEOUT,
+                 recursion_limit=DEFAULT_RECURSION_LIMIT):
+        self.memory_limit_mb = memory_limit_mb
+        self.cpu_limit = cpu_limit
+        self.timeout = timeout
+        self.recursion_limit = recursion_limit
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle = queue.Queue()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._closed = False
+
+        for _ in range(max(workers, 1)):
+            self._idle.put(self._spawn())
+        # Workers aren't daemons, so make sure they are told to stop on exit
+        atexit.register(self.close)
+
+    def _spawn(self):
+        parent_conn, child_conn = self._ctx.Pipe()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.memory_limit_mb, self.cpu_limit, self.recursion_limit),
+            # Not a daemon so large files can use the parallel analysis pool;
+            # the worker exits on its own once the pipe to this process closes
+            daemon=False,
+        )
+        process.start()
+        child_conn.close()
+        worker = _Worker(process, parent_conn)
+        with self._lock:
+            self._workers.append(worker)
+        return worker
+
+    def _kill(self, worker):
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(worker.process.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+        if worker.process.is_alive():
+            worker.process.kill()
+
+    def _replace(self, worker):
+        self._kill(worker)
+        worker.process.join()
+        worker.conn.close()
+        with self._lock:
+            self._workers.remove(worker)
+        return self._spawn()
+
+    def _crash_error(self, exitcode):
+        if exitcode == -getattr(signal, "SIGXCPU", 0):
+            return _error("cpu_limit", f"Analysis exceeded the CPU limit of {self.cpu_limit}s.")
+        if exitcode == -signal.SIGSEGV:
+            return _error("recursion_limit", "Analysis worker crashed, likely on deeply nested code.")
+        return _error("worker_crashed", f"Analysis worker exited unexpectedly (exit code {exitcode}).")
+
+    def _wait(self, worker, cancel_event):
+        """Wait for the worker's reply. Returns "done", "timeout" or "cancelled"."""
+        if cancel_event is None:
+            return "done" if worker.conn.poll(self.timeout) else "timeout"
+
+        deadline = time.monotonic() + self.timeout
+        while not worker.conn.poll(CANCEL_POLL_INTERVAL):
+            if cancel_event.is_set():
+                return "cancelled"
+            if time.monotonic() >= deadline:
+                return "timeout"
+        return "done"
+
+    def _acquire(self, cancel_event):
+        """Take an idle worker, or return None if the job is cancelled while waiting."""
+        if cancel_event is None:
+            return self._idle.get()
+        # Poll so a superseded job gives its thread back instead of queueing for a worker
+        while not cancel_event.is_set():
+            try:
+                return self._idle.get(timeout=CANCEL_POLL_INTERVAL)
+            except queue.Empty:
+                pass
+        return None
+
+    def run(self, filename, code, cancel_event=None, **options):
+        """Analyze one file in a worker. Blocks until a worker is free and the job finishes.
+
+        Extra keyword `options` (e.g. mode, latency_budget) are passed to analyze_code.
+
+        Setting `cancel_event` (a threading.Event) abandons the job: the worker running
+        it is killed and replaced so a superseded analysis stops using CPU right away.
+        """
+        return self.call(analyze_code, filename, code, cancel_event=cancel_event, **options)
+
+    def call(self, function, *args, cancel_event=None, **kwargs):
+        """Run function(*args, **kwargs) in a worker under the pool's limits.
+
+        `function` must be importable by name (a module-level function) since workers
+        are spawned processes. Returns its result, or a structured error dict.
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+
+        worker = self._acquire(cancel_event)
+        if worker is None:
+            return _error("cancelled", "Analysis was cancelled.")
+        if not worker.process.is_alive():
+            # Died while idle (OOM killer, external kill); don't fail this job for it
+            worker = self._replace(worker)
+        try:
+            worker.conn.send((function, args, kwargs))
+            status = self._wait(worker, cancel_event)
+            if status == "timeout":
+                worker = self._replace(worker)
+                return _error("timeout", f"Analysis did not finish within {self.timeout}s.")
+            if status == "cancelled":
+                worker = self._replace(worker)
+                return _error("cancelled", "Analysis was cancelled.")
+            return worker.conn.recv()
+        except (EOFError, OSError):
+            # Worker died mid-job (rlimit hit, interpreter crash, ...)
+            worker.process.join(timeout=1)
+            reply = self._crash_error(worker.process.exitcode)
+            worker = self._replace(worker)
+            return reply
+        finally:
+            self._idle.put(worker)
+
+    def close(self):
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+            except OSError:
+                pass
+        for worker in workers:
+            worker.process.join(timeout=1)
+            if worker.process.is_alive():
+                self._kill(worker)
+            worker.conn.close()